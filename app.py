@@ -4,6 +4,11 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+import pyarrow.parquet as pq
+import os
+from typing import NamedTuple
+
+from numba_kernels import agg_sum_axis01
 
 # Page configuration
 st.set_page_config(
@@ -14,7 +19,7 @@ st.set_page_config(
 )
 
 # Custom CSS for beautiful styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Main theme */
     .main {
@@ -108,22 +113,707 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# The cached call runs once; Streamlit replays the stored element on later reruns
+@st.cache_resource
+def inject_css():
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+inject_css()
+
+# Data files (Parquet copies are produced by convert_to_parquet.py)
+RISK_CSV = 'data/death rate of countries and its causes.csv'
+RISK_PARQUET = 'data/death rate of countries and its causes.parquet'
+CAUSES_CSV = 'data/cause_of_deaths2.csv'
+CAUSES_PARQUET = 'data/cause_of_deaths2.parquet'
+
+def csv_dtypes(csv_path, country_col):
+    # Column dtypes for a typed CSV parse, from the header row only
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: 'float32' for col in columns if col not in [country_col, 'Code', 'Year']}
+    dtypes.update({country_col: 'category', 'Code': 'category', 'Year': 'int16'})
+    return dtypes
+
+def read_dataset(parquet_path, csv_path, country_col):
+    # Prefer the columnar Parquet copy, fall back to a typed multithreaded CSV parse
+    if os.path.exists(parquet_path):
+        df = pd.read_parquet(parquet_path)
+    else:
+        df = pd.read_csv(csv_path, dtype=csv_dtypes(csv_path, country_col), engine='pyarrow')
+    
+    # Categorical country/code columns, int16 years and float32 metrics keep the frame compact
+    # (no-ops when the CSV was already parsed with these dtypes)
+    df[country_col] = df[country_col].astype('category')
+    categories = df[country_col].cat.categories
+    if not categories.is_monotonic_increasing:
+        # Tensor rows follow category order, which must be alphabetical
+        df[country_col] = df[country_col].cat.reorder_categories(categories.sort_values())
+    df['Code'] = df['Code'].astype('category')
+    df['Year'] = df['Year'].astype('int16')
+    metric_cols = [col for col in df.columns if col not in [country_col, 'Code', 'Year']]
+    df[metric_cols] = df[metric_cols].astype('float32')
+    return df
+
+def read_dataset_summary(parquet_path, csv_path, country_col):
+    # Countries, metric columns and year bounds, read from the header and the country/Year columns only
+    if os.path.exists(parquet_path):
+        columns = pq.read_schema(parquet_path).names
+        df = pd.read_parquet(parquet_path, columns=[country_col, 'Year'])
+    else:
+        columns = pd.read_csv(csv_path, nrows=0).columns
+        df = pd.read_csv(csv_path, usecols=[country_col, 'Year'], engine='pyarrow')
+    metrics = tuple(col for col in columns if col not in [country_col, 'Code', 'Year'])
+    return set(df[country_col].unique()), metrics, int(df['Year'].min()), int(df['Year'].max())
+
+# Dataset metadata derived once at load time instead of on every rerun
+class DatasetMeta(NamedTuple):
+    all_countries: tuple    # countries present in both datasets, sorted
+    risk_factors: tuple
+    cause_columns: tuple
+    min_year: int
+    max_year: int
 
 # Load data with caching
+# The sidebar only needs the metadata; each full dataset is loaded the first
+# time a section that shows it runs.
 @st.cache_data
-def load_data():
+def load_meta():
+    countries_risk, risk_factors, risk_min, risk_max = read_dataset_summary(RISK_PARQUET, RISK_CSV, 'Entity')
+    countries_causes, cause_columns, causes_min, causes_max = read_dataset_summary(CAUSES_PARQUET, CAUSES_CSV, 'Country/Territory')
+    return DatasetMeta(
+        all_countries=tuple(sorted(countries_risk & countries_causes)),
+        risk_factors=risk_factors,
+        cause_columns=cause_columns,
+        min_year=max(risk_min, causes_min),
+        max_year=min(risk_max, causes_max)
+    )
+
+@st.cache_data
+def load_risk():
     # Load risk factors dataset
-    df_risk = pd.read_csv('data/death rate of countries and its causes.csv')
-    
+    return read_dataset(RISK_PARQUET, RISK_CSV, 'Entity')
+
+@st.cache_data
+def load_causes():
     # Load causes of death dataset
-    df_causes = pd.read_csv('data/cause_of_deaths2.csv')
+    return read_dataset(CAUSES_PARQUET, CAUSES_CSV, 'Country/Territory')
+
+# Country x year x metric tensors
+# Each dataset is reshaped once into a dense float32 array so filtering becomes
+# index slicing and every aggregate is a single axis reduction.
+class MetricTensor(NamedTuple):
+    values: np.ndarray      # shape (countries, years, metrics), NaN where missing
+    row_totals: np.ndarray  # shape (countries, years), float64 sum over all metrics
+    has_row: np.ndarray     # shape (countries, years), True where the dataset has a row
+    countries: list
+    years: np.ndarray
+    metrics: list
+    country_to_idx: dict
+    metric_to_idx: dict
+
+def build_tensor(df, country_col):
+    countries = list(df[country_col].cat.categories)
+    years = np.sort(df['Year'].unique())
+    metrics = [col for col in df.columns if col not in [country_col, 'Code', 'Year']]
+    
+    values = np.full((len(countries), len(years), len(metrics)), np.nan, dtype=np.float32)
+    c_idx = df[country_col].cat.codes.to_numpy()
+    y_idx = np.searchsorted(years, df['Year'].to_numpy())
+    values[c_idx, y_idx, :] = df[metrics].to_numpy(dtype=np.float32)
+    has_row = np.zeros((len(countries), len(years)), dtype=bool)
+    has_row[c_idx, y_idx] = True
+    
+    return MetricTensor(
+        values=values,
+        row_totals=np.nansum(values, axis=2, dtype=np.float64),
+        has_row=has_row,
+        countries=countries,
+        years=years,
+        metrics=metrics,
+        country_to_idx={c: i for i, c in enumerate(countries)},
+        metric_to_idx={m: i for i, m in enumerate(metrics)}
+    )
+
+@st.cache_data
+def load_risk_tensor():
+    return build_tensor(load_risk(), 'Entity')
+
+@st.cache_data
+def load_causes_tensor():
+    return build_tensor(load_causes(), 'Country/Territory')
+
+def selection_index(tensor, countries, year_range):
+    # Sorted country indices and year mask of a selection
+    c_idx = np.sort(np.array([tensor.country_to_idx[c] for c in countries if c in tensor.country_to_idx], dtype=np.intp))
+    y_mask = (tensor.years >= year_range[0]) & (tensor.years <= year_range[1])
+    return c_idx, y_mask
+
+def slice_tensor(tensor, countries, year_range, cols):
+    # Select the (countries, years, cols) block of a tensor; countries come back sorted
+    c_idx, y_mask = selection_index(tensor, countries, year_range)
+    m_idx = np.array([tensor.metric_to_idx[m] for m in cols], dtype=np.intp)
+    block = tensor.values[c_idx][:, y_mask][:, :, m_idx]
+    return block, [tensor.countries[i] for i in c_idx], tensor.years[y_mask]
+
+# Sums accumulate in float64 so grand totals of the float32 data stay exact
+def tensor_totals(tensor, countries, year_range, cols):
+    # Country/year masks are fused into one pass by the Numba kernel
+    c_idx, y_mask = selection_index(tensor, countries, year_range)
+    c_mask = np.zeros(len(tensor.countries), dtype=np.bool_)
+    c_mask[c_idx] = True
+    totals = agg_sum_axis01(tensor.values, c_mask, y_mask)
+    m_idx = [tensor.metric_to_idx[m] for m in cols]
+    return pd.Series(totals[m_idx], index=list(cols))
+
+def tensor_total_deaths(tensor, countries, year_range):
+    # Grand total over the selection from the precomputed per-row totals
+    c_idx, y_mask = selection_index(tensor, countries, year_range)
+    return float(tensor.row_totals[c_idx][:, y_mask].sum())
+
+def tensor_trend(tensor, countries, year_range, metric_idx):
+    # Metrics are given as integer positions, so the block is indexed without name lookups
+    c_idx, y_mask = selection_index(tensor, countries, year_range)
+    block = tensor.values[c_idx][:, y_mask][:, :, list(metric_idx)]
+    trend = pd.DataFrame(
+        np.nansum(block, axis=0, dtype=np.float64),
+        columns=[tensor.metrics[i] for i in metric_idx]
+    )
+    trend.insert(0, 'Year', tensor.years[y_mask])
+    return trend
+
+def tensor_by_country(tensor, countries, year_range, cols, country_col):
+    block, names, _ = slice_tensor(tensor, countries, year_range, cols)
+    return pd.DataFrame(
+        np.nansum(block, axis=1, dtype=np.float64),
+        index=pd.Index(names, name=country_col),
+        columns=list(cols)
+    )
+
+def tensor_latest_year(tensor, countries, year_range):
+    # Latest year in the range with a row for any selected country, None if the selection is empty
+    c_idx, y_mask = selection_index(tensor, countries, year_range)
+    present = tensor.has_row[c_idx][:, y_mask].any(axis=0)
+    if not present.any():
+        return None
+    return int(tensor.years[y_mask][present][-1])
+
+# Cached aggregates
+# Every widget interaction reruns the whole script, so each aggregate is
+# memoized on hashable arguments (tuples of countries/columns and the year range).
+@st.cache_data(max_entries=32)
+def compute_risk_latest_year(countries, year_range):
+    risk_tensor = load_risk_tensor()
+    return tensor_latest_year(risk_tensor, countries, year_range)
+
+@st.cache_data(max_entries=32)
+def compute_cause_latest_year(countries, year_range):
+    causes_tensor = load_causes_tensor()
+    return tensor_latest_year(causes_tensor, countries, year_range)
+
+@st.cache_data(max_entries=32)
+def compute_risk_totals(countries, year_range, cols):
+    risk_tensor = load_risk_tensor()
+    return tensor_totals(risk_tensor, countries, year_range, cols)
+
+@st.cache_data(max_entries=32)
+def compute_cause_totals(countries, year_range, cols):
+    causes_tensor = load_causes_tensor()
+    return tensor_totals(causes_tensor, countries, year_range, cols)
+
+@st.cache_data(max_entries=32)
+def compute_risk_total_deaths(countries, year_range):
+    risk_tensor = load_risk_tensor()
+    return tensor_total_deaths(risk_tensor, countries, year_range)
+
+@st.cache_data(max_entries=32)
+def compute_cause_total_deaths(countries, year_range):
+    causes_tensor = load_causes_tensor()
+    return tensor_total_deaths(causes_tensor, countries, year_range)
+
+@st.cache_data(max_entries=32)
+def compute_risk_trend(countries, year_range, metric_idx):
+    risk_tensor = load_risk_tensor()
+    return tensor_trend(risk_tensor, countries, year_range, metric_idx)
+
+@st.cache_data(max_entries=32)
+def compute_cause_trend(countries, year_range, metric_idx):
+    causes_tensor = load_causes_tensor()
+    return tensor_trend(causes_tensor, countries, year_range, metric_idx)
+
+@st.cache_data(max_entries=32)
+def compute_risk_by_country(countries, year_range, cols):
+    risk_tensor = load_risk_tensor()
+    return tensor_by_country(risk_tensor, countries, year_range, cols, 'Entity')
+
+@st.cache_data(max_entries=32)
+def compute_cause_by_country(countries, year_range, cols):
+    causes_tensor = load_causes_tensor()
+    return tensor_by_country(causes_tensor, countries, year_range, cols, 'Country/Territory')
+
+@st.cache_data(max_entries=32)
+def pivot_risk_by_country(countries, year_range, risk):
+    # Year x country table of a single risk factor
+    risk_tensor = load_risk_tensor()
+    block, names, years = slice_tensor(risk_tensor, countries, year_range, (risk,))
+    pivot = pd.DataFrame(block[:, :, 0].T, columns=names)
+    pivot.insert(0, 'Year', years)
+    return pivot
+
+@st.cache_data(max_entries=32)
+def compute_risk_quartiles(countries, year_range, risk):
+    # Per-country (min, q1, median, q3, max) of a risk factor over the selected years
+    risk_tensor = load_risk_tensor()
+    block, names, _ = slice_tensor(risk_tensor, countries, year_range, (risk,))
+    quartiles = np.nanquantile(block[:, :, 0], [0, 0.25, 0.5, 0.75, 1], axis=1)
+    return pd.DataFrame(
+        quartiles.T,
+        index=pd.Index(names, name='Entity'),
+        columns=['min', 'q1', 'median', 'q3', 'max']
+    )
+
+def top_k_idx(values, k):
+    # Positions of the k largest values, descending; argpartition avoids a full sort
+    k = min(k, len(values))
+    top_idx = np.argpartition(values, -k)[-k:]
+    return top_idx[np.argsort(-values[top_idx])]
+
+def top_k(totals, k):
+    # Largest k entries of a totals Series, descending
+    return totals.iloc[top_k_idx(totals.to_numpy(), k)]
+
+def limit_countries(by_country, k):
+    # Keep the k countries with the largest totals in a per-country Series/DataFrame,
+    # preserving the original row order; metrics still use the full selection
+    if len(by_country) <= k:
+        return by_country
+    totals = by_country if by_country.ndim == 1 else by_country.sum(axis=1)
+    return by_country[by_country.index.isin(top_k(totals, k).index)]
+
+# Metric card formatting
+INT_FORMAT = ',d'
+
+def fmt_int(n):
+    # Death counts are whole numbers; round once and format with thousands separators
+    return format(int(round(n)), INT_FORMAT)
+
+# Chart helpers
+# Shared dark theme applied to every figure
+DARK_LAYOUT = dict(
+    template='plotly_dark',
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)'
+)
+
+def style_fig(fig, height=500, traces=None, **layout):
+    # Apply the shared layout, per-chart layout options and common trace options
+    fig.update_layout(**DARK_LAYOUT, height=height, **layout)
+    if traces:
+        fig.update_traces(**traces)
+    return fig
+
+def stacked_area_gl(df, x, y, labels):
+    # Stacked area chart drawn with WebGL traces; Scattergl has no stackgroup,
+    # so the running sum is stacked here and each trace fills to the previous one
+    fig = go.Figure()
+    stacked = np.zeros(len(df))
+    for i, col in enumerate(y):
+        values = np.nan_to_num(df[col].to_numpy(dtype=np.float64))
+        stacked = stacked + values
+        fig.add_trace(go.Scattergl(
+            x=df[x],
+            y=stacked,
+            name=str(col),
+            mode='lines',
+            fill='tozeroy' if i == 0 else 'tonexty',
+            customdata=values,
+            hovertemplate='%{customdata:,.0f}'
+        ))
+    fig.update_layout(
+        xaxis_title=x,
+        yaxis_title=labels['value'],
+        legend_title_text=labels['variable']
+    )
+    return fig
+
+@st.cache_data(max_entries=32)
+def compute_corr_matrix(countries, year_range, cols):
+    # Pearson correlation of the (country, year) rows in one np.corrcoef call;
+    # rows with missing values are dropped first
+    causes_tensor = load_causes_tensor()
+    block, _, _ = slice_tensor(causes_tensor, countries, year_range, cols)
+    rows = block.reshape(-1, len(cols))
+    rows = rows[~np.isnan(rows).any(axis=1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(rows, rowvar=False, dtype=np.float32)
+    return pd.DataFrame(corr, index=list(cols), columns=list(cols))
+
+@st.cache_data(max_entries=32)
+def compute_treemap_long(countries, year_range, cols):
+    # Long (country, cause, deaths) table straight from the per-country sums,
+    # built row-major so it needs no version-dependent DataFrame.stack()
+    by_country = compute_cause_by_country(countries, year_range, cols)
+    n_countries, n_causes = by_country.shape
+    return pd.DataFrame({
+        'Country/Territory': np.repeat(by_country.index.to_numpy(), n_causes),
+        'Cause': np.tile(by_country.columns.to_numpy(), n_countries),
+        'Deaths': by_country.to_numpy().ravel()
+    })
+
+# Tab fragments
+# Each tab is an st.fragment, so its own widgets only rerun that tab; inputs are
+# the hashable selection keys and everything inside reads the cached aggregates.
+@st.fragment
+def render_risk_overview(countries_key, year_key, meta):
+    # Risk factors: top risk factors and their distribution
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Top Risk Factors")
+        
+        # Aggregate risk factors
+        risk_totals = top_k(compute_risk_totals(countries_key, year_key, meta.risk_factors), 10).iloc[::-1]
+        
+        fig = px.bar(
+            x=risk_totals.values,
+            y=risk_totals.index,
+            orientation='h',
+            color=risk_totals.values,
+            color_continuous_scale='Viridis',
+            labels={'x': 'Total Deaths', 'y': 'Risk Factor'}
+        )
+        style_fig(
+            fig,
+            height=500,
+            showlegend=False,
+            coloraxis_showscale=False
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("### Risk Factor Distribution")
+        
+        # Pie chart of top 8 risk factors
+        top_risks = top_k(compute_risk_totals(countries_key, year_key, meta.risk_factors), 8)
+        
+        fig = px.pie(
+            values=top_risks.values,
+            names=top_risks.index,
+            hole=0.4,
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        style_fig(
+            fig,
+            height=500,
+            traces=dict(textposition='inside', textinfo='percent+label')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_risk_trends(countries_key, year_key, meta):
+    # Risk factors: trends over time
+    st.markdown("### Risk Factor Trends Over Time")
+    
+    # Select risk factors to trend (widget values are column positions)
+    selected_risks = st.multiselect(
+        "Select Risk Factors to Track",
+        options=range(min(20, len(meta.risk_factors))),  # Limit options for performance
+        default=list(range(min(3, len(meta.risk_factors)))),
+        format_func=lambda i: meta.risk_factors[i],
+        key="risk_trend_select"
+    )
+    
+    if selected_risks:
+        # Group by year and sum
+        trend_data = compute_risk_trend(countries_key, year_key, tuple(selected_risks))
+        
+        fig = px.line(
+            trend_data,
+            x='Year',
+            y=list(trend_data.columns[1:]),
+            labels={'value': 'Deaths', 'variable': 'Risk Factor'},
+            markers=True,
+            render_mode='webgl'
+        )
+        style_fig(
+            fig,
+            height=500,
+            hovermode='x unified',
+            traces=dict(line=dict(width=3))
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_risk_comparison(countries_key, year_key, meta, max_countries):
+    # Risk factors: country x risk factor heatmap
+    st.markdown("### Country Comparison")
+    
+    # Heatmap of risk factors by country
+    country_risk = limit_countries(compute_risk_by_country(countries_key, year_key, meta.risk_factors[:15]), max_countries)
+    
+    fig = go.Figure(go.Heatmap(
+        z=country_risk.to_numpy(dtype=np.float32),
+        x=list(country_risk.columns),
+        y=list(country_risk.index),
+        colorscale='RdYlBu_r'
+    ))
+    style_fig(
+        fig,
+        height=400,
+        xaxis_tickangle=45,
+        yaxis_autorange='reversed'
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_risk_analysis(countries_key, year_key, meta, max_countries):
+    # Risk factors: per-country area chart and distribution
+    st.markdown("### Detailed Risk Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Select a specific risk factor
+        selected_risk = st.selectbox(
+            "Select Risk Factor",
+            options=meta.risk_factors,
+            key="risk_analysis_select"
+        )
+        
+        # Show trend for this risk factor across countries
+        risk_by_country = pivot_risk_by_country(countries_key, year_key, selected_risk)
+        chart_countries = limit_countries(
+            compute_risk_by_country(countries_key, year_key, (selected_risk,))[selected_risk],
+            max_countries
+        ).index
+        
+        fig = stacked_area_gl(
+            risk_by_country,
+            x='Year',
+            y=[c for c in countries_key if c in chart_countries],
+            labels={'value': 'Deaths', 'variable': 'Country'}
+        )
+        style_fig(fig, height=400)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Box plot of risk factor distribution
+        st.markdown(f"**Distribution of {selected_risk}**")
+        
+        # Single trace built from precomputed quartiles, not the raw rows
+        quartiles = compute_risk_quartiles(countries_key, year_key, selected_risk)
+        quartiles = quartiles[quartiles.index.isin(chart_countries)]
+        fig = go.Figure(go.Box(
+            x=quartiles.index.tolist(),
+            lowerfence=quartiles['min'],
+            q1=quartiles['q1'],
+            median=quartiles['median'],
+            q3=quartiles['q3'],
+            upperfence=quartiles['max'],
+            marker_color=px.colors.qualitative.Set2[0]
+        ))
+        style_fig(
+            fig,
+            height=400,
+            showlegend=False
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_cause_overview(countries_key, year_key, meta):
+    # Causes of death: leading causes and categories
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Leading Causes of Death")
+        
+        # Aggregate causes
+        cause_totals = top_k(compute_cause_totals(countries_key, year_key, meta.cause_columns), 12).iloc[::-1]
+        
+        fig = px.bar(
+            x=cause_totals.values,
+            y=cause_totals.index,
+            orientation='h',
+            color=cause_totals.values,
+            color_continuous_scale='Reds',
+            labels={'x': 'Total Deaths', 'y': 'Cause of Death'}
+        )
+        style_fig(
+            fig,
+            height=500,
+            showlegend=False,
+            coloraxis_showscale=False
+        )
+        st.plotly_chart(fig, use_container_width=True)
     
-    return df_risk, df_causes
+    with col2:
+        st.markdown("### Death Cause Categories")
+        
+        # Sunburst chart
+        top_causes = top_k(compute_cause_totals(countries_key, year_key, meta.cause_columns), 10)
+        
+        fig = px.pie(
+            values=top_causes.values,
+            names=top_causes.index,
+            hole=0.5,
+            color_discrete_sequence=px.colors.sequential.RdBu
+        )
+        style_fig(
+            fig,
+            height=500,
+            traces=dict(textposition='inside', textinfo='percent')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_cause_trends(countries_key, year_key, meta):
+    # Causes of death: trends and year-over-year change
+    st.markdown("### Death Cause Trends Over Time")
+    
+    # Select causes to trend (widget values are column positions)
+    selected_causes = st.multiselect(
+        "Select Causes to Track",
+        options=range(len(meta.cause_columns)),
+        default=[meta.cause_columns.index(c) for c in ['Cardiovascular Diseases', 'Neoplasms', 'Lower Respiratory Infections'] if c in meta.cause_columns],
+        format_func=lambda i: meta.cause_columns[i],
+        key="cause_trend_select"
+    )
+    
+    if selected_causes:
+        # Group by year and sum
+        trend_data = compute_cause_trend(countries_key, year_key, tuple(selected_causes))
+        
+        fig = px.line(
+            trend_data,
+            x='Year',
+            y=list(trend_data.columns[1:]),
+            labels={'value': 'Deaths', 'variable': 'Cause'},
+            markers=True,
+            render_mode='webgl'
+        )
+        style_fig(
+            fig,
+            height=500,
+            hovermode='x unified',
+            traces=dict(line=dict(width=3))
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Show percentage change
+        st.markdown("#### Year-over-Year Change")
+        for cause in trend_data.columns[1:4]:
+            first_year_val = trend_data[trend_data['Year'] == year_key[0]][cause].values
+            last_year_val = trend_data[trend_data['Year'] == year_key[1]][cause].values
+            if len(first_year_val) > 0 and len(last_year_val) > 0 and first_year_val[0] > 0:
+                change = ((last_year_val[0] - first_year_val[0]) / first_year_val[0]) * 100
+                st.write(f"**{cause}**: {'📈' if change > 0 else '📉'} {change:+.1f}%")
+
+@st.fragment
+def render_cause_geographic(countries_key, year_key, meta, max_countries):
+    # Causes of death: per-country bars and treemap
+    st.markdown("### Geographic Distribution")
+    
+    # Select a cause to visualize
+    geo_cause = st.selectbox(
+        "Select Cause of Death",
+        options=meta.cause_columns,
+        index=meta.cause_columns.index('Cardiovascular Diseases') if 'Cardiovascular Diseases' in meta.cause_columns else 0,
+        key="geo_cause_select"
+    )
+    
+    # Bar chart by country
+    country_cause = limit_countries(
+        compute_cause_by_country(countries_key, year_key, (geo_cause,))[geo_cause],
+        max_countries
+    ).sort_values(ascending=True)
+    
+    fig = px.bar(
+        x=country_cause.values,
+        y=country_cause.index,
+        orientation='h',
+        color=country_cause.values,
+        color_continuous_scale='Turbo',
+        labels={'x': f'Total Deaths from {geo_cause}', 'y': 'Country'}
+    )
+    style_fig(
+        fig,
+        height=400,
+        coloraxis_showscale=False
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Treemap
+    st.markdown("### Proportional View")
+    treemap_countries = limit_countries(
+        compute_cause_by_country(countries_key, year_key, meta.cause_columns[:10]),
+        max_countries
+    ).index
+    treemap_long = compute_treemap_long(tuple(treemap_countries), year_key, meta.cause_columns[:10])
+    
+    fig = px.treemap(
+        treemap_long,
+        path=['Country/Territory', 'Cause'],
+        values='Deaths',
+        color='Deaths',
+        color_continuous_scale='RdYlGn_r'
+    )
+    style_fig(fig, height=500)
+    st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_cause_deep_dive(countries_key, year_key, meta):
+    # Causes of death: correlation matrix and single-country breakdown
+    st.markdown("### Deep Dive Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Correlation Between Causes")
+        
+        # Correlation matrix
+        corr_causes = meta.cause_columns[:10]  # Limit for readability
+        corr_data = compute_corr_matrix(countries_key, year_key, tuple(corr_causes))
+        
+        fig = go.Figure(go.Heatmap(
+            z=corr_data.to_numpy(dtype=np.float32),
+            x=list(corr_data.columns),
+            y=list(corr_data.index),
+            colorscale='RdBu'
+        ))
+        style_fig(fig, height=450, yaxis_autorange='reversed')
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("#### Year-by-Year Breakdown")
+        
+        # Select country for detailed view
+        detail_country = st.selectbox(
+            "Select Country",
+            options=list(countries_key),
+            key="detail_country"
+        )
+        
+        # Totals follow meta.cause_columns order, so their positions are the metric indices
+        country_totals = compute_cause_totals((detail_country,), year_key, meta.cause_columns)
+        top_5_idx = top_k_idx(country_totals.to_numpy(), 5)
+        country_data = compute_cause_trend((detail_country,), year_key, tuple(int(i) for i in top_5_idx))
+        
+        fig = stacked_area_gl(
+            country_data,
+            x='Year',
+            y=list(country_data.columns[1:]),
+            labels={'value': 'Deaths', 'variable': 'Cause'}
+        )
+        style_fig(
+            fig,
+            height=400,
+            title=f"Top 5 Causes in {detail_country}"
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
 # Load the data
 try:
-    df_risk, df_causes = load_data()
+    meta = load_meta()
     data_loaded = True
 except Exception as e:
     st.error(f"Error loading data: {e}")
@@ -145,32 +835,21 @@ if data_loaded:
         help="Choose which dataset to explore"
     )
     
-    # Get common columns for risk factors
-    risk_factors = [col for col in df_risk.columns if col not in ['Entity', 'Code', 'Year']]
-    
-    # Get cause columns for causes of death
-    cause_columns = [col for col in df_causes.columns if col not in ['Country/Territory', 'Code', 'Year']]
-    
     # Country filter
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🌐 Geographic Filter")
     
-    # Get unique countries from both datasets
-    countries_risk = df_risk['Entity'].unique().tolist()
-    countries_causes = df_causes['Country/Territory'].unique().tolist()
-    all_countries = sorted(list(set(countries_risk) & set(countries_causes)))
-    
     # Select All Countries option
     select_all_countries = st.sidebar.checkbox("🌍 Select All Countries", value=False)
     
     if select_all_countries:
-        selected_countries = all_countries
-        st.sidebar.info(f"✅ All {len(all_countries)} countries selected")
+        selected_countries = list(meta.all_countries)
+        st.sidebar.info(f"✅ All {len(meta.all_countries)} countries selected")
     else:
         selected_countries = st.sidebar.multiselect(
             "Select Countries",
-            options=all_countries,
-            default=['France', 'Germany', 'United States', 'Japan', 'Brazil'][:min(5, len(all_countries))] if len(all_countries) > 0 else all_countries[:5],
+            options=meta.all_countries,
+            default=['France', 'Germany', 'United States', 'Japan', 'Brazil'][:min(5, len(meta.all_countries))] if len(meta.all_countries) > 0 else meta.all_countries[:5],
             help="Select countries to compare"
         )
     
@@ -178,13 +857,10 @@ if data_loaded:
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📅 Time Period")
     
-    min_year = max(df_risk['Year'].min(), df_causes['Year'].min())
-    max_year = min(df_risk['Year'].max(), df_causes['Year'].max())
-    
     year_range = st.sidebar.slider(
         "Select Year Range",
-        min_value=int(min_year),
-        max_value=int(max_year),
+        min_value=meta.min_year,
+        max_value=meta.max_year,
         value=(1990, 2019),
         help="Filter data by year range"
     )
@@ -193,22 +869,40 @@ if data_loaded:
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🏥 Causes & Risk Factors")
     
-    # Select causes to display
+    # Select causes to display (widget values are column positions)
     selected_causes = st.sidebar.multiselect(
         "Select Causes of Death",
-        options=cause_columns,
-        default=['Cardiovascular Diseases', 'Neoplasms', 'Lower Respiratory Infections', 'Diabetes Mellitus', 'Chronic Kidney Disease'][:min(5, len(cause_columns))],
+        options=range(len(meta.cause_columns)),
+        default=[meta.cause_columns.index(c) for c in ['Cardiovascular Diseases', 'Neoplasms', 'Lower Respiratory Infections', 'Diabetes Mellitus', 'Chronic Kidney Disease'] if c in meta.cause_columns],
+        format_func=lambda i: meta.cause_columns[i],
         help="Select causes of death to analyze"
     )
     
-    # Select risk factors to display
+    # Select risk factors to display (widget values are column positions)
     selected_risk_factors = st.sidebar.multiselect(
         "Select Risk Factors",
-        options=risk_factors,
-        default=['Smoking', 'High systolic blood pressure', 'Air pollution', 'High body mass index', 'High fasting plasma glucose'][:min(5, len(risk_factors))],
+        options=range(len(meta.risk_factors)),
+        default=[meta.risk_factors.index(c) for c in ['Smoking', 'High systolic blood pressure', 'Air pollution', 'High body mass index', 'High fasting plasma glucose'] if c in meta.risk_factors],
+        format_func=lambda i: meta.risk_factors[i],
         help="Select risk factors to analyze"
     )
     
+    # Chart size limit
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 📊 Chart Options")
+    
+    max_countries = st.sidebar.slider(
+        "Max countries shown in charts",
+        min_value=10,
+        max_value=100,
+        value=25,
+        help="Per-country charts only show the countries with the most deaths"
+    )
+    
+    # Hashable cache keys for the cached filters/aggregates
+    countries_key = tuple(selected_countries)
+    year_key = tuple(year_range)
+    
     # ========================================
     # RISK FACTORS ANALYSIS
     # ========================================
@@ -216,30 +910,25 @@ if data_loaded:
         st.markdown("## 📈 Risk Factors Analysis")
         st.markdown('<div class="info-box">This dataset shows deaths attributable to various risk factors like air pollution, smoking, diet, and lifestyle choices.</div>', unsafe_allow_html=True)
         
-        # Filter data
-        df_risk_filtered = df_risk[
-            (df_risk['Entity'].isin(selected_countries)) & 
-            (df_risk['Year'] >= year_range[0]) & 
-            (df_risk['Year'] <= year_range[1])
-        ]
+        # Latest year with data in the selection (None when nothing matches)
+        latest_year = compute_risk_latest_year(countries_key, year_key)
         
-        if len(df_risk_filtered) > 0:
+        if latest_year is not None:
             # Top row - Key Metrics
             col1, col2, col3, col4 = st.columns(4)
             
-            latest_year = df_risk_filtered['Year'].max()
-            latest_data = df_risk_filtered[df_risk_filtered['Year'] == latest_year]
+            latest_totals = compute_risk_totals(countries_key, (latest_year, latest_year), meta.risk_factors)
             
             with col1:
-                total_deaths = latest_data[risk_factors].sum().sum()
+                total_deaths = compute_risk_total_deaths(countries_key, (latest_year, latest_year))
                 st.metric(
                     label="🔴 Total Deaths (Latest Year)",
-                    value=f"{total_deaths:,.0f}",
+                    value=fmt_int(total_deaths),
                     delta=f"Year {latest_year}"
                 )
             
             with col2:
-                top_risk = latest_data[risk_factors].sum().idxmax()
+                top_risk = latest_totals.index[int(latest_totals.to_numpy().argmax())]
                 st.metric(
                     label="⚠️ Top Risk Factor",
                     value=top_risk[:25] + "..." if len(top_risk) > 25 else top_risk
@@ -265,161 +954,16 @@ if data_loaded:
             tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "📈 Trends", "🗺️ Comparison", "🌍 World Map", "🔍 Analysis"])
             
             with tab1:
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("### Top Risk Factors")
-                    
-                    # Aggregate risk factors
-                    risk_totals = df_risk_filtered[risk_factors].sum().sort_values(ascending=True).tail(10)
-                    
-                    fig = px.bar(
-                        x=risk_totals.values,
-                        y=risk_totals.index,
-                        orientation='h',
-                        color=risk_totals.values,
-                        color_continuous_scale='Viridis',
-                        labels={'x': 'Total Deaths', 'y': 'Risk Factor'}
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500,
-                        showlegend=False,
-                        coloraxis_showscale=False
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                with col2:
-                    st.markdown("### Risk Factor Distribution")
-                    
-                    # Pie chart of top 8 risk factors
-                    top_risks = df_risk_filtered[risk_factors].sum().sort_values(ascending=False).head(8)
-                    
-                    fig = px.pie(
-                        values=top_risks.values,
-                        names=top_risks.index,
-                        hole=0.4,
-                        color_discrete_sequence=px.colors.sequential.Plasma
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500,
-                    )
-                    fig.update_traces(textposition='inside', textinfo='percent+label')
-                    st.plotly_chart(fig, use_container_width=True)
+                render_risk_overview(countries_key, year_key, meta)
             
             with tab2:
-                st.markdown("### Risk Factor Trends Over Time")
-                
-                # Select risk factors to trend
-                selected_risks = st.multiselect(
-                    "Select Risk Factors to Track",
-                    options=risk_factors[:20],  # Limit options for performance
-                    default=risk_factors[:3] if len(risk_factors) >= 3 else risk_factors,
-                    key="risk_trend_select"
-                )
-                
-                if selected_risks:
-                    # Group by year and sum
-                    trend_data = df_risk_filtered.groupby('Year')[selected_risks].sum().reset_index()
-                    
-                    fig = px.line(
-                        trend_data,
-                        x='Year',
-                        y=selected_risks,
-                        labels={'value': 'Deaths', 'variable': 'Risk Factor'},
-                        markers=True
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500,
-                        hovermode='x unified'
-                    )
-                    fig.update_traces(line=dict(width=3))
-                    st.plotly_chart(fig, use_container_width=True)
+                render_risk_trends(countries_key, year_key, meta)
             
             with tab3:
-                st.markdown("### Country Comparison")
-                
-                # Heatmap of risk factors by country
-                country_risk = df_risk_filtered.groupby('Entity')[risk_factors[:15]].sum()
-                
-                fig = px.imshow(
-                    country_risk.values,
-                    x=country_risk.columns,
-                    y=country_risk.index,
-                    color_continuous_scale='RdYlBu_r',
-                    aspect='auto'
-                )
-                fig.update_layout(
-                    template='plotly_dark',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    height=400,
-                    xaxis_tickangle=45
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                render_risk_comparison(countries_key, year_key, meta, max_countries)
             
             with tab4:
-                st.markdown("### Detailed Risk Analysis")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    # Select a specific risk factor
-                    selected_risk = st.selectbox(
-                        "Select Risk Factor",
-                        options=risk_factors,
-                        key="risk_analysis_select"
-                    )
-                    
-                    # Show trend for this risk factor across countries
-                    risk_by_country = df_risk_filtered.pivot_table(
-                        index='Year',
-                        columns='Entity',
-                        values=selected_risk,
-                        aggfunc='sum'
-                    ).reset_index()
-                    
-                    fig = px.area(
-                        risk_by_country,
-                        x='Year',
-                        y=selected_countries,
-                        labels={'value': 'Deaths', 'variable': 'Country'}
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=400
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                with col2:
-                    # Box plot of risk factor distribution
-                    st.markdown(f"**Distribution of {selected_risk}**")
-                    
-                    fig = px.box(
-                        df_risk_filtered,
-                        x='Entity',
-                        y=selected_risk,
-                        color='Entity',
-                        color_discrete_sequence=px.colors.qualitative.Set2
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=400,
-                        showlegend=False
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                render_risk_analysis(countries_key, year_key, meta, max_countries)
         else:
             st.warning("No data available for the selected filters. Please adjust your selection.")
     
@@ -433,30 +977,25 @@ if data_loaded:
         st.markdown("## 💀 Causes of Death Analysis")
         st.markdown('<div class="info-box">This dataset shows deaths by specific medical causes like cardiovascular diseases, cancer, infectious diseases, and more.</div>', unsafe_allow_html=True)
         
-        # Filter data
-        df_causes_filtered = df_causes[
-            (df_causes['Country/Territory'].isin(selected_countries)) & 
-            (df_causes['Year'] >= year_range[0]) & 
-            (df_causes['Year'] <= year_range[1])
-        ]
+        # Latest year with data in the selection (None when nothing matches)
+        latest_year = compute_cause_latest_year(countries_key, year_key)
         
-        if len(df_causes_filtered) > 0:
+        if latest_year is not None:
             # Top row - Key Metrics
             col1, col2, col3, col4 = st.columns(4)
             
-            latest_year = df_causes_filtered['Year'].max()
-            latest_data = df_causes_filtered[df_causes_filtered['Year'] == latest_year]
+            latest_totals = compute_cause_totals(countries_key, (latest_year, latest_year), meta.cause_columns)
             
             with col1:
-                total_deaths = latest_data[cause_columns].sum().sum()
+                total_deaths = compute_cause_total_deaths(countries_key, (latest_year, latest_year))
                 st.metric(
                     label="💀 Total Deaths (Latest Year)",
-                    value=f"{total_deaths:,.0f}",
+                    value=fmt_int(total_deaths),
                     delta=f"Year {latest_year}"
                 )
             
             with col2:
-                top_cause = latest_data[cause_columns].sum().idxmax()
+                top_cause = latest_totals.index[int(latest_totals.to_numpy().argmax())]
                 st.metric(
                     label="🏥 Leading Cause",
                     value=top_cause[:25] + "..." if len(top_cause) > 25 else top_cause
@@ -464,9 +1003,9 @@ if data_loaded:
             
             with col3:
                 # Calculate cardiovascular deaths percentage
-                cardio_cols = [c for c in cause_columns if 'Cardio' in c or 'Heart' in c]
+                cardio_cols = [c for c in meta.cause_columns if 'Cardio' in c or 'Heart' in c]
                 if cardio_cols:
-                    cardio_deaths = latest_data[cardio_cols].sum().sum()
+                    cardio_deaths = latest_totals[cardio_cols].sum()
                     cardio_pct = (cardio_deaths / total_deaths * 100) if total_deaths > 0 else 0
                     st.metric(
                         label="❤️ Cardiovascular %",
@@ -477,15 +1016,15 @@ if data_loaded:
             
             with col4:
                 # Cancer deaths
-                cancer_cols = [c for c in cause_columns if 'Neoplasm' in c or 'Cancer' in c]
+                cancer_cols = [c for c in meta.cause_columns if 'Neoplasm' in c or 'Cancer' in c]
                 if cancer_cols:
-                    cancer_deaths = latest_data[cancer_cols].sum().sum()
+                    cancer_deaths = latest_totals[cancer_cols].sum()
                     st.metric(
                         label="🎗️ Cancer Deaths",
-                        value=f"{cancer_deaths:,.0f}"
+                        value=fmt_int(cancer_deaths)
                     )
                 else:
-                    st.metric(label="📊 Causes Tracked", value=len(cause_columns))
+                    st.metric(label="📊 Causes Tracked", value=len(meta.cause_columns))
             
             st.markdown("---")
             
@@ -493,196 +1032,16 @@ if data_loaded:
             tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "📈 Trends", "🗺️ Geographic", "🔬 Deep Dive"])
             
             with tab1:
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("### Leading Causes of Death")
-                    
-                    # Aggregate causes
-                    cause_totals = df_causes_filtered[cause_columns].sum().sort_values(ascending=True).tail(12)
-                    
-                    fig = px.bar(
-                        x=cause_totals.values,
-                        y=cause_totals.index,
-                        orientation='h',
-                        color=cause_totals.values,
-                        color_continuous_scale='Reds',
-                        labels={'x': 'Total Deaths', 'y': 'Cause of Death'}
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500,
-                        showlegend=False,
-                        coloraxis_showscale=False
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                with col2:
-                    st.markdown("### Death Cause Categories")
-                    
-                    # Sunburst chart
-                    top_causes = df_causes_filtered[cause_columns].sum().sort_values(ascending=False).head(10)
-                    
-                    fig = px.pie(
-                        values=top_causes.values,
-                        names=top_causes.index,
-                        hole=0.5,
-                        color_discrete_sequence=px.colors.sequential.RdBu
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500
-                    )
-                    fig.update_traces(textposition='inside', textinfo='percent')
-                    st.plotly_chart(fig, use_container_width=True)
+                render_cause_overview(countries_key, year_key, meta)
             
             with tab2:
-                st.markdown("### Death Cause Trends Over Time")
-                
-                # Select causes to trend
-                selected_causes = st.multiselect(
-                    "Select Causes to Track",
-                    options=cause_columns,
-                    default=['Cardiovascular Diseases', 'Neoplasms', 'Lower Respiratory Infections'][:min(3, len(cause_columns))],
-                    key="cause_trend_select"
-                )
-                
-                if selected_causes:
-                    # Group by year and sum
-                    trend_data = df_causes_filtered.groupby('Year')[selected_causes].sum().reset_index()
-                    
-                    fig = px.line(
-                        trend_data,
-                        x='Year',
-                        y=selected_causes,
-                        labels={'value': 'Deaths', 'variable': 'Cause'},
-                        markers=True
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=500,
-                        hovermode='x unified'
-                    )
-                    fig.update_traces(line=dict(width=3))
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Show percentage change
-                    st.markdown("#### Year-over-Year Change")
-                    for cause in selected_causes[:3]:
-                        first_year_val = trend_data[trend_data['Year'] == year_range[0]][cause].values
-                        last_year_val = trend_data[trend_data['Year'] == year_range[1]][cause].values
-                        if len(first_year_val) > 0 and len(last_year_val) > 0 and first_year_val[0] > 0:
-                            change = ((last_year_val[0] - first_year_val[0]) / first_year_val[0]) * 100
-                            st.write(f"**{cause}**: {'📈' if change > 0 else '📉'} {change:+.1f}%")
+                render_cause_trends(countries_key, year_key, meta)
             
             with tab3:
-                st.markdown("### Geographic Distribution")
-                
-                # Select a cause to visualize
-                geo_cause = st.selectbox(
-                    "Select Cause of Death",
-                    options=cause_columns,
-                    index=cause_columns.index('Cardiovascular Diseases') if 'Cardiovascular Diseases' in cause_columns else 0,
-                    key="geo_cause_select"
-                )
-                
-                # Bar chart by country
-                country_cause = df_causes_filtered.groupby('Country/Territory')[geo_cause].sum().sort_values(ascending=True)
-                
-                fig = px.bar(
-                    x=country_cause.values,
-                    y=country_cause.index,
-                    orientation='h',
-                    color=country_cause.values,
-                    color_continuous_scale='Turbo',
-                    labels={'x': f'Total Deaths from {geo_cause}', 'y': 'Country'}
-                )
-                fig.update_layout(
-                    template='plotly_dark',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    height=400,
-                    coloraxis_showscale=False
-                )
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Treemap
-                st.markdown("### Proportional View")
-                treemap_data = df_causes_filtered.groupby('Country/Territory')[cause_columns[:10]].sum().reset_index()
-                treemap_melted = treemap_data.melt(id_vars=['Country/Territory'], var_name='Cause', value_name='Deaths')
-                
-                fig = px.treemap(
-                    treemap_melted,
-                    path=['Country/Territory', 'Cause'],
-                    values='Deaths',
-                    color='Deaths',
-                    color_continuous_scale='RdYlGn_r'
-                )
-                fig.update_layout(
-                    template='plotly_dark',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    height=500
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                render_cause_geographic(countries_key, year_key, meta, max_countries)
             
             with tab4:
-                st.markdown("### Deep Dive Analysis")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("#### Correlation Between Causes")
-                    
-                    # Correlation matrix
-                    corr_causes = cause_columns[:10]  # Limit for readability
-                    corr_data = df_causes_filtered[corr_causes].corr()
-                    
-                    fig = px.imshow(
-                        corr_data,
-                        color_continuous_scale='RdBu',
-                        aspect='auto'
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=450
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                
-                with col2:
-                    st.markdown("#### Year-by-Year Breakdown")
-                    
-                    # Select country for detailed view
-                    detail_country = st.selectbox(
-                        "Select Country",
-                        options=selected_countries,
-                        key="detail_country"
-                    )
-                    
-                    country_data = df_causes_filtered[df_causes_filtered['Country/Territory'] == detail_country]
-                    top_5_causes = country_data[cause_columns].sum().sort_values(ascending=False).head(5).index.tolist()
-                    
-                    fig = px.area(
-                        country_data,
-                        x='Year',
-                        y=top_5_causes,
-                        labels={'value': 'Deaths', 'variable': 'Cause'}
-                    )
-                    fig.update_layout(
-                        template='plotly_dark',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        height=400,
-                        title=f"Top 5 Causes in {detail_country}"
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                render_cause_deep_dive(countries_key, year_key, meta)
         else:
             st.warning("No data available for the selected filters. Please adjust your selection.")
     
@@ -694,15 +1053,15 @@ if data_loaded:
         st.markdown("## 🔗 Risk Factors vs Causes Correlation")
         st.markdown('<div class="info-box">Explore the relationship between risk factors and actual causes of death.</div>', unsafe_allow_html=True)
         
-        # Merge datasets for comparison
-        df_risk_agg = df_risk[df_risk['Entity'].isin(selected_countries)].groupby(['Entity', 'Year'])[risk_factors[:5]].sum().reset_index()
-        df_causes_agg = df_causes[df_causes['Country/Territory'].isin(selected_countries)].groupby(['Country/Territory', 'Year'])[cause_columns[:5]].sum().reset_index()
+        # Same cached totals as the Overview tabs above, so nothing is re-aggregated here
+        risk_totals = compute_risk_totals(countries_key, year_key, meta.risk_factors)
+        cause_totals = compute_cause_totals(countries_key, year_key, meta.cause_columns)
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("### Risk Factors Summary")
-            risk_summary = df_risk_agg[risk_factors[:5]].sum()
+            risk_summary = risk_totals[list(meta.risk_factors[:5])]
             
             fig = px.bar(
                 x=risk_summary.index,
@@ -711,10 +1070,8 @@ if data_loaded:
                 color_continuous_scale='Viridis',
                 labels={'x': 'Risk Factor', 'y': 'Total Deaths'}
             )
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
+            style_fig(
+                fig,
                 height=350,
                 coloraxis_showscale=False,
                 xaxis_tickangle=45
@@ -723,7 +1080,7 @@ if data_loaded:
         
         with col2:
             st.markdown("### Causes Summary")
-            cause_summary = df_causes_agg[cause_columns[:5]].sum()
+            cause_summary = cause_totals[list(meta.cause_columns[:5])]
             
             fig = px.bar(
                 x=cause_summary.index,
@@ -732,10 +1089,8 @@ if data_loaded:
                 color_continuous_scale='Reds',
                 labels={'x': 'Cause', 'y': 'Total Deaths'}
             )
-            fig.update_layout(
-                template='plotly_dark',
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
+            style_fig(
+                fig,
                 height=350,
                 coloraxis_showscale=False,
                 xaxis_tickangle=45
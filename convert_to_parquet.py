@@ -0,0 +1,27 @@
+"""One-shot conversion of the dashboard CSV files to Parquet.
+
+Run once from the project root after updating the CSVs:
+
+    python convert_to_parquet.py
+
+app.py loads the Parquet files when they exist, which is much faster than
+parsing the CSVs on every cold start.
+"""
+import pandas as pd
+
+# CSV source -> Parquet destination
+DATASETS = {
+    'data/death rate of countries and its causes.csv': 'data/death rate of countries and its causes.parquet',
+    'data/cause_of_deaths2.csv': 'data/cause_of_deaths2.parquet',
+}
+
+
+def main():
+    for csv_path, parquet_path in DATASETS.items():
+        df = pd.read_csv(csv_path)
+        df.to_parquet(parquet_path, engine='pyarrow', index=False)
+        print(f"Wrote {parquet_path} ({len(df)} rows)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Numba kernels for the dashboard's tensor aggregations.
+
+The tensors built in app.py have shape (countries, years, metrics) and hold
+NaN where a country has no data for a year.
+
+The kernels are compiled serially: Streamlit runs scripts on worker threads,
+where parallel (prange) launches can deadlock, and the tensors are small
+enough that thread start-up would outweigh any gain.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def agg_sum_axis01(tensor, cmask, ymask):
+    """Sum a (countries, years, metrics) tensor over the masked countries and years.
+
+    Both masks are applied in a single pass and NaN cells are skipped.
+    Per-metric totals are accumulated and returned as float64.
+    """
+    n_countries, n_years, n_metrics = tensor.shape
+    totals = np.zeros(n_metrics, dtype=np.float64)
+    for c in range(n_countries):
+        if not cmask[c]:
+            continue
+        for y in range(n_years):
+            if not ymask[y]:
+                continue
+            for m in range(n_metrics):
+                value = tensor[c, y, m]
+                if not np.isnan(value):
+                    totals[m] += value
+    return totals